@@ -1,62 +1,105 @@
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
-from typing import Any, Dict, List, Optional
-from uuid import uuid4
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from collections import defaultdict
+import os
+from datetime import datetime, timezone
+import hashlib
 import re
-import json
+import unicodedata
+import orjson
+import time
 import asyncio
-import httpx
-import traceback
+import logging
 from pydantic import ValidationError
 
-from app.services.llm_client import cultural_fact, country_details
-from app.schemas.telex import (
-    JSONRPCRequest,
-    JSONRPCResponse,
-    TelexMessage,
-    TaskResult,
-    TaskStatus,
-    Configuration,
-    MessagePart,
-    PushNotificationConfig,
+from app.core.cache import TTLCache
+from app.core.config import (
+    DETAILS_TIMEOUT,
+    FACT_TIMEOUT,
+    SUMMARY_CACHE_TTL,
+    SUMMARY_STALE_TTL,
+)
+from app.services.llm_client import (
+    FACT_ERROR_TEXT,
+    cache_stats,
+    cultural_fact,
+    cultural_fact_stream,
+    country_details,
+    groq_load,
+)
+from app.schemas.telex import JSONRPCRequest
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Typographic apostrophes users paste in, mapped to the ASCII one
+_APOSTROPHES = str.maketrans({"\u2019": "'", "\u2018": "'", "\u02bc": "'"})
+
+
+def _fold(t: str) -> str:
+    """Fold accents and typographic apostrophes to plain ASCII ("côte" -> "cote")."""
+    t = unicodedata.normalize("NFKD", t.translate(_APOSTROPHES))
+    return t.encode("ascii", "ignore").decode("ascii")
+
+
+# Multi-word countries, stored folded so "côte d'ivoire" and "cote d'ivoire"
+# are one entry; the matcher only ever sees ASCII
+MULTI_WORD_COUNTRIES = frozenset(
+    _fold(_name)
+    for _name in {
+        "south africa",
+        "saudi arabia",
+        "new zealand",
+        "united kingdom",
+        "united states",
+        "costa rica",
+        "czech republic",
+        "dominican republic",
+        "ivory coast",
+        "cote d'ivoire",
+        "côte d'ivoire",
+        "papua new guinea",
+        "trinidad and tobago",
+        "bosnia and herzegovina",
+        "north macedonia",
+        "united arab emirates",
+        "sri lanka",
+        "south korea",
+        "north korea",
+        "hong kong",
+        "sierra leone",
+        "vatican city",
+        "el salvador",
+    }
 )
 
-router = APIRouter()
-
-# Multi-word countries
-MULTI_WORD_COUNTRIES = {
-    "south africa",
-    "saudi arabia",
-    "new zealand",
-    "united kingdom",
-    "united states",
-    "costa rica",
-    "czech republic",
-    "dominican republic",
-    "ivory coast",
-    "cote d'ivoire",
-    "côte d'ivoire",
-    "papua new guinea",
-    "trinidad and tobago",
-    "bosnia and herzegovina",
-    "north macedonia",
-    "united arab emirates",
-    "sri lanka",
-    "south korea",
-    "north korea",
-    "hong kong",
-    "sierra leone",
-    "vatican city",
-    "el salvador",
-}
+# Last word -> (word count, full name), longest name first, so one
+# right-to-left pass over the tokens finds the rightmost multi-word country
+_MW_BY_LAST: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+for _name in MULTI_WORD_COUNTRIES:
+    _MW_BY_LAST[_name.rsplit(" ", 1)[-1]].append((_name.count(" ") + 1, _name))
+for _names in _MW_BY_LAST.values():
+    _names.sort(reverse=True)
+
+
+# Patterns compiled once at import; extract_country runs on every A2A request
+_CLEAN_BRACES = re.compile(r"[{}]")
+_CLEAN_TAGS = re.compile(r"<[^>]+>")
+_WS = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[a-z][a-z''\-]+")
+# "about X" with X ending at a follow-up phrase, punctuation or the end
+_RE_ABOUT = re.compile(
+    r"(?:tell me about|fact about|about|information on)\s+([a-z][a-z\s''\-]+?)(?:\s+tell|\s+fact|\s+information|[\.\!\?]|\s*$)"
+)
 
 
 def _clean_text(t: str) -> str:
     """Remove HTML tags, braces, normalize whitespace."""
-    t = re.sub(r"[{}]", " ", t or "")
-    t = re.sub(r"<[^>]+>", " ", t)
-    return re.sub(r"\s+", " ", t).strip()
+    t = _CLEAN_BRACES.sub(" ", t or "")
+    t = _CLEAN_TAGS.sub(" ", t)
+    return _WS.sub(" ", t).strip()
 
 
 def extract_country(text: str) -> str:
@@ -65,24 +108,35 @@ def extract_country(text: str) -> str:
     Prioritizes explicit phrases like "tell me about X".
     Returns the LAST country mentioned in the text.
     """
-    s = _clean_text(text).lower()
-
-    # Try explicit patterns first (these take precedence)
-    patterns = [
-        r"(?:tell me about|fact about|about|information on)\s+([a-z][a-z\s''\-]+?)(?:\s+tell|\s+fact|\s+information|\s*$)",
-        r"(?:tell me about|fact about|about|information on)\s+([a-z][a-z\s''\-]+)[\.\!\?]",
-    ]
-
-    # Find ALL matches with explicit patterns
-    explicit_matches = []
-    for pat in patterns:
-        for m in re.finditer(pat, s):
-            candidate = m.group(1).strip(" .!?,;:")
-            explicit_matches.append(candidate)
-
-    # If we found explicit mentions, return the LAST one
-    if explicit_matches:
-        last_match = explicit_matches[-1]
+    s = (text or "").strip()
+    if not s:
+        return ""
+
+    # Fast path: a bare single-word name ("Kenya") needs no regex work
+    if " " not in s and s.isascii() and s.isalpha() and len(s) > 1:
+        return s.title()
+
+    # Plain ASCII text without markup or odd whitespace is already clean
+    if (
+        s.isascii()
+        and s.isprintable()
+        and "  " not in s
+        and not any(c in s for c in "<>{}")
+    ):
+        s = s.lower()
+    else:
+        s = _clean_text(s)
+        if not s.isascii():
+            s = _fold(s)
+        s = s.lower()
+
+    # Explicit mentions take precedence; the LAST one wins
+    last_match = None
+    for m in _RE_ABOUT.finditer(s):
+        last_match = m.group(1)
+
+    if last_match is not None:
+        last_match = last_match.strip(" .!?,;:")
         # Check if it's a multi-word country
         if last_match in MULTI_WORD_COUNTRIES:
             return last_match.title()
@@ -90,92 +144,235 @@ def extract_country(text: str) -> str:
         first_word = last_match.split()[0]
         return first_word.title()
 
-    # Token-based extraction - scan from RIGHT to LEFT
-    tokens = re.findall(r"[a-z][a-z''\-]+", s)
+    # Token-based extraction
+    tokens = _TOKEN_RE.findall(s)
     if not tokens:
         return ""
 
-    # Check last two tokens for multi-word countries
-    if len(tokens) >= 2:
-        last_two = f"{tokens[-2]} {tokens[-1]}"
-        if last_two in MULTI_WORD_COUNTRIES:
-            return last_two.title()
-
-    # Scan backwards for any multi-word match
-    for i in range(len(tokens) - 2, -1, -1):
-        two_words = f"{tokens[i]} {tokens[i+1]}"
-        if two_words in MULTI_WORD_COUNTRIES:
-            return two_words.title()
+    # Rightmost multi-word country: walk the tokens backwards and try the
+    # names ending at each one (most inputs end with the country)
+    for end in range(len(tokens), 0, -1):
+        # A dangling hyphen/apostrophe ("new zealand-") still ends the name
+        last = tokens[end - 1].rstrip("'-")
+        for n, name in _MW_BY_LAST.get(last, ()):
+            if n <= end and " ".join(tokens[end - n : end - 1] + [last]) == name:
+                return name.title()
 
     # Return last token as country
     return tokens[-1].title()
 
 
+_RESP_TEMPLATE = (
+    "{name}{code}\n"
+    "- Capital: {capital}\n"
+    "- Region: {region} ({subregion})\n"
+    "- Population: {population}\n"
+    "- Languages: {languages}\n"
+    "- Currencies: {currencies}\n"
+    "- Timezones: {timezones}\n"
+    "\n"
+    "Cultural fact: {fact}"
+)
+
+
 def format_country_response(details: Optional[Dict[str, Any]], fact: str) -> str:
     """Format country details and fact into readable text."""
     if not details:
         return fact
 
-    name = details.get("name", "Unknown")
-    capital = ", ".join(details.get("capital", [])) or "N/A"
-    region = details.get("region", "N/A")
-    subregion = details.get("subregion", "N/A")
-
+    code = details.get("cca2") or details.get("cca3")
     pop = details.get("population_estimate")
-    population = f"{pop:,}" if isinstance(pop, int) else "N/A"
 
-    languages = ", ".join(details.get("languages", [])) or "N/A"
-    currencies = ", ".join(details.get("currencies", [])) or "N/A"
-    timezones = ", ".join(details.get("timezones", [])) or "N/A"
+    # "or ()" so a null list from the LLM reads as N/A instead of raising
+    return _RESP_TEMPLATE.format_map(
+        {
+            "name": details.get("name", "Unknown"),
+            "code": f" [{code}]" if code else "",
+            "capital": ", ".join(details.get("capital") or ()) or "N/A",
+            "region": details.get("region", "N/A"),
+            "subregion": details.get("subregion", "N/A"),
+            "population": f"{pop:,}" if isinstance(pop, int) else "N/A",
+            "languages": ", ".join(details.get("languages") or ()) or "N/A",
+            "currencies": ", ".join(details.get("currencies") or ()) or "N/A",
+            "timezones": ", ".join(details.get("timezones") or ()) or "N/A",
+            "fact": fact,
+        }
+    )
 
-    code = details.get("cca2") or details.get("cca3") or ""
-    code_display = f" [{code}]" if code else ""
 
-    return f"""{name}{code_display}
-- Capital: {capital}
-- Region: {region} ({subregion})
-- Population: {population}
-- Languages: {languages}
-- Currencies: {currencies}
-- Timezones: {timezones}
+# Finished summaries keyed on the normalized country name
+_SUMMARY_CACHE = TTLCache(ttl=SUMMARY_CACHE_TTL, stale_ttl=SUMMARY_STALE_TTL)
 
-Cultural fact: {fact}"""
+# Summaries currently being built; concurrent callers await the same task
+_INFLIGHT: Dict[str, asyncio.Task] = {}
 
+# Misses that joined an in-flight build instead of starting their own, and
+# expired summaries served while a rebuild ran
+_SUMMARY_STATS = {"coalesced": 0, "stale": 0}
 
-async def country_summary_with_fact(country_name: str) -> str:
-    """Main processing logic with error handling."""
+
+async def _build_summary(country_name: str, key: str) -> str:
+    """Fetch details and fact in parallel and format them."""
     try:
-        # Parallel requests for speed
-        details_task = country_details(country_name)
-        fact_task = cultural_fact(country_name)
+        # Parallel requests for speed, each with its own bound so a slow
+        # fact can't hold the details (or the caller) hostage
+        details_task = asyncio.wait_for(
+            country_details(country_name), timeout=DETAILS_TIMEOUT
+        )
+        fact_task = asyncio.wait_for(cultural_fact(country_name), timeout=FACT_TIMEOUT)
 
         details, fact = await asyncio.gather(
             details_task, fact_task, return_exceptions=True
         )
+        complete = True
 
         # Handle partial failures
-        if isinstance(details, Exception):
-            print(f"[ERROR] Details fetch failed: {details}")
+        if isinstance(details, BaseException):
+            logger.warning("[SUMMARY] Details fetch failed: %r", details)
             details = None
 
-        if isinstance(fact, Exception):
-            print(f"[ERROR] Fact fetch failed: {fact}")
+        if isinstance(fact, BaseException):
+            logger.warning("[SUMMARY] Fact fetch failed: %r", fact)
             fact = "Cultural fact unavailable at this time."
+            complete = False
 
-        return format_country_response(details, fact)
+        summary = format_country_response(details, fact)
 
-    except Exception as e:
-        print(f"[ERROR] country_summary_with_fact: {traceback.format_exc()}")
+        # Only cache complete answers so a transient failure isn't replayed
+        if complete and details and fact != FACT_ERROR_TEXT:
+            _SUMMARY_CACHE.set(key, summary)
+
+        return summary
+
+    except Exception:
+        logger.exception("[SUMMARY] Failed for %s", country_name)
         return f"Sorry, I encountered an error processing information about {country_name}."
 
 
+def _start_build(country_name: str, key: str) -> asyncio.Task:
+    """Build the summary in its own task, registered in _INFLIGHT until done."""
+    task = asyncio.create_task(_build_summary(country_name, key))
+    _INFLIGHT[key] = task
+
+    def _done(t: asyncio.Task) -> None:
+        if _INFLIGHT.get(key) is t:
+            del _INFLIGHT[key]
+
+    task.add_done_callback(_done)
+    return task
+
+
+async def country_summary_with_fact(country_name: str) -> str:
+    """Main processing logic, cached and deduplicated per country."""
+    key = country_name.strip().lower()
+    cached = _SUMMARY_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    task = _INFLIGHT.get(key)
+
+    # Expired but within the grace window: answer now and rebuild off the
+    # request path; a failed rebuild leaves the stale copy in place
+    stale = _SUMMARY_CACHE.get_stale(key)
+    if stale is not None:
+        _SUMMARY_STATS["stale"] += 1
+        if task is None:
+            _start_build(country_name, key)
+        return stale
+
+    if task is not None:
+        _SUMMARY_STATS["coalesced"] += 1
+    else:
+        task = _start_build(country_name, key)
+
+    # shield: the build belongs to no single caller, so a cancelled request
+    # (client gone, caller-side wait_for) leaves it running for the others
+    return await asyncio.shield(task)
+
+
+async def preload_summaries(countries: Iterable[str]) -> None:
+    """Build and cache summaries for countries ahead of the first request."""
+    names = {c.strip().lower(): c for c in countries if c.strip()}
+    if not names:
+        return
+
+    results = await asyncio.gather(
+        *(country_summary_with_fact(c) for c in names.values()),
+        return_exceptions=True,
+    )
+    failed = 0
+    for name, result in zip(names.values(), results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.warning("[PRELOAD] %s failed: %s", name, result)
+    logger.info("[PRELOAD] Built %d/%d summaries", len(names) - failed, len(names))
+
+
+async def country_summary_stream(country_name: str) -> AsyncIterator[str]:
+    """Yield the country summary, streaming the cultural fact as it's generated."""
+    # A summary already built by the blocking endpoints goes out in one chunk
+    cached = _SUMMARY_CACHE.get(country_name.strip().lower())
+    if cached is not None:
+        yield cached
+        return
+
+    try:
+        details = await asyncio.wait_for(
+            country_details(country_name), timeout=DETAILS_TIMEOUT
+        )
+    except Exception as e:
+        logger.warning("[SUMMARY] Details fetch failed: %s", e)
+        details = None
+
+    # Header ends with "Cultural fact: ", the fact tokens follow it
+    if details:
+        yield format_country_response(details, "")
+
+    async for chunk in cultural_fact_stream(country_name):
+        yield chunk
+
+
+def _sse_event(event: Optional[str], data: str) -> str:
+    """Frame one server-sent event; multi-line data gets one data: line each."""
+    lines = "\n".join(f"data: {line}" for line in data.split("\n"))
+    return f"event: {event}\n{lines}\n\n" if event else f"{lines}\n\n"
+
+
+# [formatted timestamp, epoch second it was formatted for]
+_TS_CACHE: List[Any] = ["", 0]
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO-8601, re-formatted at most once per second."""
+    t = int(time.time())
+    if t != _TS_CACHE[1]:
+        _TS_CACHE[0] = (
+            datetime.fromtimestamp(t, timezone.utc).isoformat().replace("+00:00", "Z")
+        )
+        _TS_CACHE[1] = t
+    return _TS_CACHE[0]
+
+
+def _new_id() -> str:
+    """Random RFC 4122 v4 id in the dashed form Telex shows.
+
+    Same result as str(uuid4()) without building a UUID object; with three
+    to five ids per reply it is measurably cheaper.
+    """
+    n = int.from_bytes(os.urandom(16), "big")
+    # Version 4 in the time_hi nibble, RFC 4122 variant in clock_seq_hi
+    n = (n & ~(0xF000 << 64) & ~(0xC000 << 48)) | (0x4000 << 64) | (0x8000 << 48)
+    h = "%032x" % n
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
 def _make_agent_message(task_id: str, text: str) -> dict:
     """Create a simple agent message dict matching successful examples."""
     return {
         "kind": "message",
         "role": "agent",
         "parts": [{"kind": "text", "text": text}],
-        "messageId": str(uuid4()),
+        "messageId": _new_id(),
         "taskId": task_id,
     }
 
@@ -190,74 +387,230 @@ def _make_user_message(user_text: str, original_message_id: str) -> dict:
     }
 
 
+# Constant JSON-RPC envelope pieces, encoded once; only id/result/error vary
+_RPC_PREFIX = b'{"jsonrpc":"2.0","id":'
+_RPC_RESULT = b',"result":'
+_RPC_ERROR = b',"error":'
+_RPC_PARSE_ERROR = (
+    _RPC_PREFIX + b'null,"error":{"code":-32700,"message":"Parse error"}}'
+)
+_SUPPORTED_METHODS = ["message/send", "message/stream"]
+
+# A Telex message is a few KB; anything far bigger is rejected unparsed
+MAX_RPC_BODY_BYTES = 64_000
+
+
+def _rpc_bytes(req_id: Any, member: bytes, value: Any) -> bytes:
+    """Splice id and result/error into the pre-encoded envelope."""
+    return _RPC_PREFIX + orjson.dumps(req_id) + member + orjson.dumps(value) + b"}"
+
+
+def _rpc_error(
+    req_id: Any,
+    code: int,
+    message: str,
+    data: Optional[dict] = None,
+    status_code: int = 200,
+) -> Response:
+    """JSON-RPC error response (HTTP 200 by default, as Telex expects)."""
+    error: Dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return Response(
+        content=_rpc_bytes(req_id, _RPC_ERROR, error),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+async def _read_body_capped(request: Request, limit: int) -> Optional[bytes]:
+    """Read the request body, giving up (None) as soon as it exceeds limit."""
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def _await_summary(summary_task: Optional[asyncio.Task], country: str) -> str:
+    """Wait for a pre-started summary task, mapping no-country/timeout to text."""
+    if summary_task is None:
+        return "Please specify a country (e.g., 'tell me about Kenya')."
+    try:
+        return await asyncio.wait_for(summary_task, timeout=25.0)
+    except asyncio.TimeoutError:
+        return f"Sorry, gathering information about {country} took too long."
+
+
+def _completed_task(
+    task_id: str,
+    context_id: str,
+    country: str,
+    result_text: str,
+    user_msg: dict,
+) -> dict:
+    """COMPLETED task result WITH ARTIFACTS."""
+    agent_msg = _make_agent_message(task_id, result_text)
+    now = _now_iso()
+    return {
+        "id": task_id,
+        "contextId": context_id,
+        "status": {
+            "state": "completed",  # Use 'completed' not 'running'
+            "timestamp": now,
+            "message": agent_msg,
+        },
+        "artifacts": [
+            {
+                "artifactId": _new_id(),
+                "name": "countryInformation",
+                "parts": [
+                    {
+                        "kind": "data",
+                        "data": {
+                            "country": country,
+                            "response": result_text,
+                            "timestamp": now,
+                        },
+                    }
+                ],
+            },
+            {
+                "artifactId": _new_id(),
+                "name": "countrySummary",
+                "parts": [{"kind": "text", "text": result_text}],
+            },
+        ],
+        "history": [user_msg, agent_msg],
+        "kind": "task",
+    }
+
+
+# Replies for unusable /a2a/* input, encoded once
+_NO_TEXT_REPLY = b"Please provide a country name (e.g., 'tell me about Japan')."
+_NO_COUNTRY_REPLY = b"Please specify a country (e.g., 'tell me about Japan')."
+_NO_COUNTRY_EVENT = _sse_event("token", _NO_COUNTRY_REPLY.decode())
+
+
 @router.post("/a2a/message", response_class=PlainTextResponse)
 async def a2a_text(body: Dict[str, Any], request: Request):
     """
     Simple HTTP A2A endpoint (blocking only).
     Accepts: {"text": "tell me about Kenya"}
-    Returns: Plain text response
+    Returns: Plain text response, streamed so the first byte goes out at once
     """
     trace_id = request.headers.get("X-Telex-Trace-Id", "unknown")
-    print(f"[A2A/TEXT] trace={trace_id} in")
+    logger.info("[A2A/TEXT] trace=%s in", trace_id)
 
+    trace_headers = {"X-Telex-Trace-Id": trace_id}
     txt = (body.get("text") or "").strip()
 
     if not txt:
-        return "Please provide a country name (e.g., 'tell me about Japan')."
+        return PlainTextResponse(_NO_TEXT_REPLY, headers=trace_headers)
+
+    country = extract_country(txt)
+    logger.info("[A2A/TEXT] Extracted country: %r", country)
+
+    if not country:
+        return PlainTextResponse(_NO_COUNTRY_REPLY, headers=trace_headers)
+
+    async def body_chunks() -> AsyncIterator[str]:
+        # One byte up front so proxies and clients see the response start
+        # (and idle timeouts reset) while the LLM is still working
+        yield " "
+        try:
+            # Timeout protection
+            result = await asyncio.wait_for(
+                country_summary_with_fact(country), timeout=25.0
+            )
+            logger.info("[A2A/TEXT] trace=%s out len=%d", trace_id, len(result))
+            yield result
 
-    try:
-        country = extract_country(txt)
-        print(f"[A2A/TEXT] Extracted country: '{country}'")
+        except asyncio.TimeoutError:
+            logger.warning("[A2A/TEXT] trace=%s timeout", trace_id)
+            yield "Sorry, that took too long. Please try again."
+        except Exception as e:
+            logger.exception("[A2A/TEXT] trace=%s error", trace_id)
+            yield f"Sorry, I encountered an error: {str(e)}"
 
-        if not country:
-            return "Please specify a country (e.g., 'tell me about Japan')."
+    return StreamingResponse(
+        body_chunks(), media_type="text/plain; charset=utf-8", headers=trace_headers
+    )
 
-        # Timeout protection
-        result = await asyncio.wait_for(
-            country_summary_with_fact(country), timeout=25.0
-        )
 
-        print(f"[A2A/TEXT] trace={trace_id} out len={len(result)}")
-        return result
+@router.post("/a2a/stream")
+async def a2a_stream(body: Dict[str, Any], request: Request):
+    """
+    Streaming HTTP A2A endpoint.
+    Accepts: {"text": "tell me about Kenya"}
+    Returns: text/event-stream of "token" events, then a final "done" event
+    """
+    trace_id = request.headers.get("X-Telex-Trace-Id", "unknown")
+    logger.info("[A2A/STREAM] trace=%s in", trace_id)
 
-    except asyncio.TimeoutError:
-        print(f"[A2A/TEXT] trace={trace_id} timeout")
-        return "Sorry, that took too long. Please try again."
-    except Exception as e:
-        print(f"[A2A/TEXT] trace={trace_id} error: {traceback.format_exc()}")
-        return f"Sorry, I encountered an error: {str(e)}"
+    txt = (body.get("text") or "").strip()
+    country = extract_country(txt) if txt else ""
+    logger.info("[A2A/STREAM] Extracted country: %r", country)
+
+    async def events() -> AsyncIterator[str]:
+        if not country:
+            yield _NO_COUNTRY_EVENT
+        else:
+            try:
+                async for chunk in country_summary_stream(country):
+                    yield _sse_event("token", chunk)
+            except Exception as e:
+                logger.exception("[A2A/STREAM] trace=%s error", trace_id)
+                yield _sse_event("error", f"Sorry, I encountered an error: {str(e)}")
+        yield _sse_event("done", "")
+        logger.info("[A2A/STREAM] trace=%s out", trace_id)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 @router.post("/a2a/country_info")
 async def a2a_country(request: Request):
     """
     JSON-RPC A2A endpoint - FORCE BLOCKING MODE to avoid validation issues.
+    message/stream answers over SSE: a RUNNING status, then the COMPLETED task.
     """
     trace_id = request.headers.get("X-Telex-Trace-Id", "unknown")
 
-    # Parse request
+    # Reject oversized bodies before reading (or parsing) them
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_RPC_BODY_BYTES:
+        return _rpc_error(None, -32600, "Payload too large", status_code=413)
+
+    raw = await _read_body_capped(request, MAX_RPC_BODY_BYTES)
+    if raw is None:
+        return _rpc_error(None, -32600, "Payload too large", status_code=413)
+
+    # Parse and validate the envelope in one pass
     try:
-        body = await request.json()
-        print(f"[A2A/COUNTRY] Received request for method: {body.get('method')}")
-    except json.JSONDecodeError as e:
-        return JSONResponse(
-            status_code=400,
-            content={
-                "jsonrpc": "2.0",
-                "id": None,
-                "error": {"code": -32700, "message": "Parse error"},
-            },
+        rpc = JSONRPCRequest.model_validate_json(raw)
+    except ValidationError as e:
+        if any(err["type"] == "json_invalid" for err in e.errors()):
+            return Response(
+                content=_RPC_PARSE_ERROR,
+                status_code=400,
+                media_type="application/json",
+            )
+        return _rpc_error(
+            None, -32600, "Invalid Request", {"details": str(e)}, status_code=400
         )
 
-    req_id = body.get("id")
-    method = body.get("method")
-    params = body.get("params", {})
+    logger.info("[A2A/COUNTRY] trace=%s method=%s", trace_id, rpc.method)
 
-    # FORCE BLOCKING MODE to avoid validation issues
-    blocking = True  # Always use blocking mode
+    req_id = rpc.id
+    method = rpc.method
+    params = rpc.params
 
+    # Always BLOCKING: configuration.blocking is ignored to avoid validation issues
     try:
-        if method == "message/send":
+        if method in ("message/send", "message/stream"):
             msg_data = params.get("message", {})
 
             # Extract user text from message parts
@@ -270,36 +623,18 @@ async def a2a_country(request: Request):
             if not user_text:
                 raise ValueError("No text content found in message parts")
 
-            task_id = msg_data.get("taskId") or str(uuid4())
-            context_id = params.get("contextId") or str(uuid4())
-            original_message_id = msg_data.get("messageId")
-
-            print(f"[A2A/COUNTRY] Processing in BLOCKING mode: '{user_text[:50]}...'")
-
-            # Process immediately (BLOCKING)
+            # Start the upstream calls right away; the bookkeeping below
+            # overlaps with them instead of delaying them
             country = extract_country(user_text)
-            print(f"[A2A/COUNTRY] Extracted country: '{country}'")
-
-            if not country:
-                result_text = "Please specify a country (e.g., 'tell me about Kenya')."
-            else:
-                try:
-                    result_text = await asyncio.wait_for(
-                        country_summary_with_fact(country), timeout=25.0
-                    )
-                except asyncio.TimeoutError:
-                    result_text = (
-                        f"Sorry, gathering information about {country} took too long."
-                    )
+            summary_task = (
+                asyncio.create_task(country_summary_with_fact(country))
+                if country
+                else None
+            )
 
-            # Create messages
-            agent_msg = {
-                "kind": "message",
-                "role": "agent",
-                "parts": [{"kind": "text", "text": result_text}],
-                "messageId": str(uuid4()),
-                "taskId": task_id,
-            }
+            task_id = msg_data.get("taskId") or _new_id()
+            context_id = params.get("contextId") or _new_id()
+            original_message_id = msg_data.get("messageId")
 
             user_msg = {
                 "kind": "message",
@@ -308,110 +643,99 @@ async def a2a_country(request: Request):
                 "messageId": original_message_id,
             }
 
-            # Build COMPLETED response (blocking mode) WITH ARTIFACTS
-            response = {
-                "jsonrpc": "2.0",
-                "id": req_id,
-                "result": {
-                    "id": task_id,
-                    "contextId": context_id,
-                    "status": {
-                        "state": "completed",  # Use 'completed' not 'running'
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "message": agent_msg,
-                    },
-                    "artifacts": [
-                        {
-                            "artifactId": str(uuid4()),
-                            "name": "countryInformation",
-                            "parts": [
-                                {
-                                    "kind": "data",
-                                    "data": {
-                                        "country": country,
-                                        "response": result_text,
-                                        "timestamp": datetime.utcnow().isoformat(),
-                                    },
-                                }
-                            ],
-                        },
-                        {
-                            "artifactId": str(uuid4()),
-                            "name": "countrySummary",
-                            "parts": [{"kind": "text", "text": result_text}],
-                        },
-                    ],
-                    "history": [user_msg, agent_msg],
-                    "kind": "task",
-                },
-            }
+            logger.info("[A2A/COUNTRY] Processing in BLOCKING mode: %.50r", user_text)
+            logger.info("[A2A/COUNTRY] Extracted country: %r", country)
+
+            if method == "message/stream":
+                # SSE: a RUNNING status right away, then the COMPLETED task
+                async def task_events() -> AsyncIterator[str]:
+                    running = {
+                        "id": task_id,
+                        "contextId": context_id,
+                        "status": {"state": "running", "timestamp": _now_iso()},
+                        "artifacts": [],
+                        "history": [user_msg],
+                        "kind": "task",
+                    }
+                    yield _sse_event(
+                        None, _rpc_bytes(req_id, _RPC_RESULT, running).decode()
+                    )
+
+                    result_text = await _await_summary(summary_task, country)
+                    task = _completed_task(
+                        task_id, context_id, country, result_text, user_msg
+                    )
+                    yield _sse_event(
+                        None, _rpc_bytes(req_id, _RPC_RESULT, task).decode()
+                    )
+                    logger.info(
+                        "[A2A/COUNTRY] ✅ Streamed COMPLETED task for %r", country
+                    )
+
+                return StreamingResponse(task_events(), media_type="text/event-stream")
 
-            print(
-                f"[A2A/COUNTRY] ✅ Returned COMPLETED response for '{country}' with artifacts"
+            result_text = await _await_summary(summary_task, country)
+            task = _completed_task(task_id, context_id, country, result_text, user_msg)
+
+            logger.info("[A2A/COUNTRY] ✅ Returned COMPLETED response for %r", country)
+            return Response(
+                content=_rpc_bytes(req_id, _RPC_RESULT, task),
+                media_type="application/json",
             )
-            return JSONResponse(status_code=200, content=response)
 
         # Method not found
-        return JSONResponse(
-            status_code=200,
-            content={
-                "jsonrpc": "2.0",
-                "id": req_id,
-                "error": {
-                    "code": -32601,
-                    "message": f"Method not found: {method}",
-                    "data": {"supported_methods": ["message/send"]},
-                },
-            },
+        return _rpc_error(
+            req_id,
+            -32601,
+            f"Method not found: {method}",
+            {"supported_methods": _SUPPORTED_METHODS},
         )
 
     except ValueError as ve:
-        return JSONResponse(
-            status_code=200,
-            content={
-                "jsonrpc": "2.0",
-                "id": req_id,
-                "error": {
-                    "code": -32602,
-                    "message": "Invalid params",
-                    "data": {"details": str(ve)},
-                },
-            },
-        )
+        return _rpc_error(req_id, -32602, "Invalid params", {"details": str(ve)})
     except Exception as e:
-        print(f"[A2A/COUNTRY] ❌ Error: {traceback.format_exc()}")
-        return JSONResponse(
-            status_code=200,
-            content={
-                "jsonrpc": "2.0",
-                "id": req_id,
-                "error": {
-                    "code": -32603,
-                    "message": "Internal error",
-                    "data": {"details": str(e)},
-                },
-            },
-        )
+        logger.exception("[A2A/COUNTRY] ❌ Internal error req_id=%s", req_id)
+        return _rpc_error(req_id, -32603, "Internal error", {"details": str(e)})
 
 
 @router.get("/country")
-async def get_country_info(name: str):
+async def get_country_info(name: str, request: Request):
     """Debug endpoint for quick testing."""
-    try:
-        country = extract_country(name)
-        if not country:
-            raise HTTPException(status_code=400, detail="Invalid country name")
+    # Outside the try so the 400 isn't swallowed by the catch-all below
+    country = extract_country(name)
+    if not country:
+        raise HTTPException(status_code=400, detail="Invalid country name")
 
+    try:
         result = await asyncio.wait_for(
             country_summary_with_fact(country), timeout=25.0
         )
 
-        return {"country": country, "info": result}
+        body = {"country": country, "info": result}
+
+        # Degraded answers (no details, failed fact) are never cached by
+        # _build_summary, and stale ones are already past their TTL, so only
+        # a fresh cached summary may be kept by proxies or browsers
+        if _SUMMARY_CACHE.peek(country.strip().lower()) is not result:
+            return ORJSONResponse(body, headers={"Cache-Control": "no-store"})
+
+        # Pollers re-asking for the same country get a bodiless 304
+        etag = (
+            '"%s"'
+            % hashlib.blake2b(
+                f"{country}\n{result}".encode(), digest_size=8
+            ).hexdigest()
+        )
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        return ORJSONResponse(body, headers=headers)
 
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="Request timeout")
     except Exception as e:
-        print(f"[GET/COUNTRY] Error: {traceback.format_exc()}")
+        logger.exception("[GET/COUNTRY] Error")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -421,5 +745,10 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "Atlas Country Agent",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
+        "cache": {
+            "summary": {**_SUMMARY_CACHE.stats(), **_SUMMARY_STATS},
+            **cache_stats(),
+        },
+        "groq": groq_load(),
     }
@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """In-process LRU map whose entries expire ``ttl`` seconds after being set.
+
+    With ``stale_ttl`` set, expired entries are kept that much longer so
+    ``get_stale`` can still hand them out while a fresh value is fetched.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        ts, value = entry
+        age = time.monotonic() - ts
+        if age >= self.ttl:
+            if age >= self.ttl + self.stale_ttl:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_stale(self, key: Hashable) -> Optional[Any]:
+        """Return the value even if expired, as long as it is within stale_ttl."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        ts, value = entry
+        if time.monotonic() - ts >= self.ttl + self.stale_ttl:
+            del self._data[key]
+            return None
+        return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Return the value only while fresh, without counting or reordering."""
+        entry = self._data.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+
+        # Evict least recently used entries
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters, for the health endpoint."""
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._data)
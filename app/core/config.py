@@ -1,5 +1,7 @@
+import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 # Optional: load .env for local dev (Railway uses env vars directly)
@@ -16,12 +18,68 @@ if ENV_PATH.exists():
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
 GROQ_MODEL = os.environ.get("GROQ_MODEL", "llama-3.1-8b-instant")
 
+# Root log level; WARNING skips building the per-request INFO records.
+# Unknown names would make logging.basicConfig raise, so they fall back to INFO
+LOG_LEVEL_REQUESTED = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_LEVEL = (
+    LOG_LEVEL_REQUESTED
+    if LOG_LEVEL_REQUESTED in logging.getLevelNamesMapping()
+    else "INFO"
+)
+
+# Cache lifetimes in seconds (country details barely change, facts can rotate)
+SUMMARY_CACHE_TTL = float(os.environ.get("SUMMARY_CACHE_TTL", 6 * 3600))
+DETAILS_CACHE_TTL = float(os.environ.get("DETAILS_CACHE_TTL", 24 * 3600))
+FACT_CACHE_TTL = float(os.environ.get("FACT_CACHE_TTL", 5 * 60))
+# Extra time an expired summary may still be served while it is rebuilt in
+# the background (0 disables stale-while-revalidate)
+SUMMARY_STALE_TTL = float(os.environ.get("SUMMARY_STALE_TTL", 3600))
+
+# Per-call bounds for the two Groq calls behind each summary; the fact
+# degrades gracefully, so it gets the tighter default
+DETAILS_TIMEOUT = float(os.environ.get("DETAILS_TIMEOUT", 15.0))
+FACT_TIMEOUT = float(os.environ.get("FACT_TIMEOUT", 8.0))
+
+# Most Groq calls allowed in flight at once; size it to the account's tier
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 20))
+
+# Optional Redis cache shared across workers/restarts (disabled when unset)
+REDIS_URL = os.environ.get("REDIS_URL")
+SHARED_DETAILS_TTL = float(os.environ.get("SHARED_DETAILS_TTL", 7 * 24 * 3600))
+
+# Comma-separated countries whose summaries are built in the background at
+# startup, so the first requests for them skip Groq (e.g. "Japan,Kenya")
+PRELOAD_COUNTRIES = tuple(
+    c.strip() for c in os.environ.get("PRELOAD_COUNTRIES", "").split(",") if c.strip()
+)
+
 
 # Backward-compatible settings object
 @dataclass(frozen=True)
 class Settings:
     GROQ_API_KEY: str | None = GROQ_API_KEY
     GROQ_MODEL: str = GROQ_MODEL
+    LOG_LEVEL: str = LOG_LEVEL
+    SUMMARY_CACHE_TTL: float = SUMMARY_CACHE_TTL
+    DETAILS_CACHE_TTL: float = DETAILS_CACHE_TTL
+    FACT_CACHE_TTL: float = FACT_CACHE_TTL
+    SUMMARY_STALE_TTL: float = SUMMARY_STALE_TTL
+    DETAILS_TIMEOUT: float = DETAILS_TIMEOUT
+    FACT_TIMEOUT: float = FACT_TIMEOUT
+    LLM_MAX_CONCURRENCY: int = LLM_MAX_CONCURRENCY
+    REDIS_URL: str | None = REDIS_URL
+    SHARED_DETAILS_TTL: float = SHARED_DETAILS_TTL
+    PRELOAD_COUNTRIES: tuple[str, ...] = PRELOAD_COUNTRIES
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings, built on first use."""
+    return Settings()
 
 
-settings = Settings()
+def __getattr__(name: str):
+    # Keeps ``from app.core.config import settings`` working
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,30 @@
+import httpx
+from typing import Optional
+
+# Process-wide client shared by Groq calls and webhook pushes, so requests
+# reuse pooled keep-alive (and multiplexed HTTP/2) connections
+_HTTP: Optional[httpx.AsyncClient] = None
+
+
+def get_http() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _HTTP
+    if _HTTP is None:
+        _HTTP = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=64,
+                max_connections=100,
+                keepalive_expiry=30,
+            ),
+        )
+    return _HTTP
+
+
+async def close_http() -> None:
+    """Close the shared client (called on app shutdown)."""
+    global _HTTP
+    if _HTTP is not None:
+        await _HTTP.aclose()
+        _HTTP = None
@@ -1,14 +1,53 @@
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import LOG_LEVEL, LOG_LEVEL_REQUESTED
+
+_LISTENER: Optional[QueueListener] = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records without formatting tracebacks on the caller's thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now so later mutation can't change the message; the
+        # exc_info traceback is formatted by the listener thread instead
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
 def setup_logging():
-    """Configure structured logging for production."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
+    """Configure structured logging for production.
+
+    Request handlers only put records on a queue; a QueueListener thread
+    formats them and writes to stdout, so logging never blocks the event loop.
+    """
+    global _LISTENER
+
+    if _LISTENER is None:
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+
+        log_queue = queue.SimpleQueue()
+        _LISTENER = QueueListener(log_queue, stream, respect_handler_level=True)
+        _LISTENER.start()
+        atexit.register(_LISTENER.stop)
+
+        logging.basicConfig(
+            level=LOG_LEVEL,
+            handlers=[_DeferredQueueHandler(log_queue)],
+        )
+        if LOG_LEVEL != LOG_LEVEL_REQUESTED:
+            logging.getLogger("atlas_agent").warning(
+                "Unknown LOG_LEVEL %r, using %s", LOG_LEVEL_REQUESTED, LOG_LEVEL
+            )
 
     # Set specific log levels
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -0,0 +1,74 @@
+import logging
+from typing import Any, Optional
+
+import orjson
+
+from app.core.config import REDIS_URL
+
+try:
+    import redis.asyncio as aioredis  # pip install redis (optional)
+except ImportError:  # pragma: no cover - only without the extra installed
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+# Cache shared by every worker and surviving restarts. Only enabled when
+# REDIS_URL is set; otherwise callers fall back to their in-process caches
+_REDIS: Optional["aioredis.Redis"] = None
+
+
+def get_redis() -> Optional["aioredis.Redis"]:
+    """Return the shared Redis client, or None when Redis is not configured."""
+    global _REDIS
+    if _REDIS is None and REDIS_URL and aioredis is not None:
+        _REDIS = aioredis.Redis.from_url(
+            REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+        )
+    return _REDIS
+
+
+async def shared_get(key: str) -> Optional[Any]:
+    """Return the decoded value for key, or None on a miss, bad value or Redis error."""
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        raw = await client.get(key)
+    except Exception as e:
+        logger.warning("[CACHE] Redis get %s failed: %s", key, e)
+        return None
+
+    if raw is None:
+        return None
+
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Not ours (or truncated): drop it so the next call refetches
+        logger.warning("[CACHE] Undecodable value under %s, deleting", key)
+        try:
+            await client.delete(key)
+        except Exception:
+            pass
+        return None
+
+
+async def shared_set(key: str, value: Any, ttl: float) -> None:
+    """Store value under key for ttl seconds; errors are logged and ignored."""
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        await client.set(key, orjson.dumps(value), ex=int(ttl))
+    except Exception as e:
+        logger.warning("[CACHE] Redis set %s failed: %s", key, e)
+
+
+async def close_redis() -> None:
+    """Close the shared client (called on app shutdown)."""
+    global _REDIS
+    if _REDIS is not None:
+        await _REDIS.aclose()
+        _REDIS = None
@@ -1,15 +1,39 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api.v1 import countries
+from app.core.config import PRELOAD_COUNTRIES
+from app.core.http_client import close_http, get_http
 from app.core.logging_config import setup_logging
+from app.core.shared_cache import close_redis
 
 # Setup logging
 logger = setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the shared HTTP client now rather than on the first push
+    get_http()
+    # Warm configured countries in the background; traffic is served meanwhile
+    # and anything that fails here is simply fetched on first request
+    preload = asyncio.create_task(countries.preload_summaries(PRELOAD_COUNTRIES))
+    logger.info("🚀 Atlas Country Agent started")
+    yield
+    logger.info("🛑 Atlas Country Agent shutting down")
+    preload.cancel()
+    await asyncio.gather(close_http(), close_redis())
+
+
 app = FastAPI(
     title="Atlas Country Agent",
     description="Telex A2A integration for country information",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -31,13 +55,3 @@ async def root():
 @app.get("/health")
 async def health():
     return {"status": "healthy", "service": "Atlas Country Bot"}
-
-
-@app.on_event("startup")
-async def startup_event():
-    logger.info("🚀 Atlas Country Agent started")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("🛑 Atlas Country Agent shutting down")
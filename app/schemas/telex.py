@@ -1,6 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any, Literal
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Any, Literal, Union
 
 
 class MessagePart(BaseModel):
@@ -34,10 +33,13 @@ class TaskResult(BaseModel):
 
 
 class JSONRPCRequest(BaseModel):
+    # Telex adds fields of its own; ignore them rather than reject the call
+    model_config = ConfigDict(extra="ignore")
+
     jsonrpc: Literal["2.0"]
     method: str
-    params: Dict[str, Any]
-    id: str
+    params: Dict[str, Any] = {}
+    id: Optional[Union[str, int]] = None
 
 
 class JSONRPCResponse(BaseModel):
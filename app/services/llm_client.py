@@ -1,11 +1,125 @@
+import asyncio
 import httpx
 import json
+import logging
 import re
-import traceback
-from typing import Optional, Dict, Any
-from app.core.config import GROQ_API_KEY, GROQ_MODEL
+import orjson
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, AsyncIterator
+from app.core.cache import TTLCache
+from app.core.config import (
+    GROQ_API_KEY,
+    GROQ_MODEL,
+    LLM_MAX_CONCURRENCY,
+    DETAILS_CACHE_TTL,
+    FACT_CACHE_TTL,
+    FACT_TIMEOUT,
+    SHARED_DETAILS_TTL,
+)
+from app.core.http_client import get_http
+from app.core.shared_cache import shared_get, shared_set
+
+logger = logging.getLogger(__name__)
 
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_TIMEOUT = 20
+# The key is fixed for the process, so every call shares one headers dict
+# (httpx copies it into its own Headers and never mutates it)
+_GROQ_HEADERS = {
+    "Authorization": f"Bearer {GROQ_API_KEY}",
+    "Content-Type": "application/json",
+}
+
+# Returned by cultural_fact when generation fails, so callers can skip caching it
+FACT_ERROR_TEXT = "Sorry, I couldn't generate a cultural fact right now."
+
+# Country details are essentially static, keyed on the normalized name
+_DETAILS_CACHE = TTLCache(ttl=DETAILS_CACHE_TTL)
+
+# Facts are meant to vary, so they are only kept long enough to absorb bursts
+# (e.g. while the details call for the same country keeps failing)
+_FACT_CACHE = TTLCache(ttl=FACT_CACHE_TTL)
+
+# Prompts are fixed apart from the country name, so only the user content is
+# built per call; the system messages are shared (orjson only reads them)
+_DETAILS_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a geodata assistant. Output JSON only.",
+}
+_DETAILS_PROMPT_PREFIX = "Provide structured country info for: "
+_DETAILS_PROMPT_SUFFIX = """
+
+Respond with JSON only (no markdown, no commentary). Structure:
+{
+  "name": "string",
+  "capital": ["string"],
+  "region": "string",
+  "subregion": "string|null",
+  "population_estimate": "integer|null",
+  "languages": ["string"],
+  "currencies": ["string"],
+  "timezones": ["string"],
+  "cca2": "string|null",
+  "cca3": "string|null"
+}"""
+
+_FACT_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are a concise cultural assistant.",
+}
+_FACT_PROMPT_PREFIX = "Provide ONE interesting, specific cultural fact about "
+_FACT_PROMPT_SUFFIX = '''.
+
+Constraints:
+- 1 short paragraph (<= 60 words)
+- Avoid politics, NSFW content, stereotypes
+- Prefer: festivals, food, arts, etiquette, traditions, language
+- No emojis
+
+Example: "In Japan, the 'Cherry Blossom Viewing' tradition dates back centuries..."'''
+
+# Caps concurrent Groq calls so bursts queue here instead of turning into
+# 429s; _GROQ_LOAD backs the /health numbers
+_GROQ_SEM = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+_GROQ_LOAD = {"active": 0, "waiting": 0}
+
+
+@asynccontextmanager
+async def _groq_slot(wait: Optional[float] = None) -> AsyncIterator[None]:
+    """Hold one of the LLM_MAX_CONCURRENCY Groq slots for the block.
+
+    Raises TimeoutError if no slot frees up within ``wait`` seconds; callers
+    without their own deadline must pass one, since httpx's timeout only
+    starts once the slot is held.
+    """
+    _GROQ_LOAD["waiting"] += 1
+    try:
+        await asyncio.wait_for(_GROQ_SEM.acquire(), timeout=wait)
+    finally:
+        _GROQ_LOAD["waiting"] -= 1
+
+    _GROQ_LOAD["active"] += 1
+    try:
+        yield
+    finally:
+        _GROQ_LOAD["active"] -= 1
+        _GROQ_SEM.release()
+
+
+def groq_load() -> Dict[str, int]:
+    """Groq calls in flight and queued for a slot."""
+    return {**_GROQ_LOAD, "limit": LLM_MAX_CONCURRENCY}
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Size and hit/miss counters of the details and fact caches."""
+    return {"details": _DETAILS_CACHE.stats(), "fact": _FACT_CACHE.stats()}
+
+
+# Patterns used on every Groq reply, compiled once at import
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+_JSON_DECODER = json.JSONDecoder()
 
 
 def extract_first_json_object(text: str) -> Optional[Dict[str, Any]]:
@@ -13,90 +127,64 @@ def extract_first_json_object(text: str) -> Optional[Dict[str, Any]]:
     if not text:
         return None
 
+    # With response_format=json_object the reply is normally bare JSON
+    if text[:1] == "{":
+        try:
+            obj = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            if isinstance(obj, dict):
+                return obj
+
     # Strip markdown code fences
-    m = re.search(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL | re.IGNORECASE)
+    m = _CODE_FENCE_RE.search(text)
     candidate = m.group(1) if m else text
 
     # Find first opening brace
     start = candidate.find("{")
     if start == -1:
         return None
+    candidate = candidate[start:]
 
-    # Parse with brace counting
-    depth = 0
-    in_string = False
-    escape = False
-    quote_char = ""
-
-    for i in range(start, len(candidate)):
-        ch = candidate[i]
-
-        if in_string:
-            if escape:
-                escape = False
-            elif ch == "\\":
-                escape = True
-            elif ch == quote_char:
-                in_string = False
-        else:
-            if ch in ('"', "'"):
-                in_string = True
-                quote_char = ch
-            elif ch == "{":
-                depth += 1
-            elif ch == "}":
-                depth -= 1
-                if depth == 0:
-                    chunk = candidate[start : i + 1]
-                    try:
-                        return json.loads(chunk)
-                    except Exception:
-                        # Try removing trailing commas
-                        chunk = re.sub(r",(\s*[}\]])", r"\1", chunk)
-                        try:
-                            return json.loads(chunk)
-                        except Exception:
-                            pass
+    # raw_decode parses one object from the brace and ignores whatever
+    # follows, doing in C what a hand-written brace counter would do per
+    # character; the comma repair runs on the sliced text so the object
+    # still starts at 0
+    for attempt in (candidate, _TRAILING_COMMA_RE.sub(r"\1", candidate)):
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(attempt)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(obj, dict):
+            return obj
     return None
 
 
 async def country_details(country: str) -> Optional[Dict[str, Any]]:
     """Fetch structured country information from Groq."""
     if not country or not GROQ_API_KEY:
-        print("[GROQ] Missing country or API key")
+        logger.warning("[GROQ] Missing country or API key")
         return None
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json",
-    }
+    key = country.strip().lower()
+    cached = _DETAILS_CACHE.get(key)
+    if cached is not None:
+        return cached
 
-    schema_note = """
-Respond with JSON only (no markdown, no commentary). Structure:
-{
-  "name": "string",
-  "capital": ["string"],
-  "region": "string",
-  "subregion": "string|null",
-  "population_estimate": "integer|null",
-  "languages": ["string"],
-  "currencies": ["string"],
-  "timezones": ["string"],
-  "cca2": "string|null",
-  "cca3": "string|null"
-}
-""".strip()
+    # Details barely change, so other workers' (or past runs') answers hold
+    cached = await shared_get(f"cd:{key}")
+    if isinstance(cached, dict):
+        _DETAILS_CACHE.set(key, cached)
+        return cached
 
     payload = {
         "model": GROQ_MODEL,
         "messages": [
-            {
-                "role": "system",
-                "content": "You are a geodata assistant. Output JSON only.",
-            },
+            _DETAILS_SYSTEM_MSG,
             {
                 "role": "user",
-                "content": f"Provide structured country info for: {country}\n\n{schema_note}",
+                "content": _DETAILS_PROMPT_PREFIX + country + _DETAILS_PROMPT_SUFFIX,
             },
         ],
         "temperature": 0.1,
@@ -104,66 +192,122 @@ Respond with JSON only (no markdown, no commentary). Structure:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            response = await client.post(GROQ_API_URL, headers=headers, json=payload)
-            response.raise_for_status()
+        client = get_http()
+        async with _groq_slot():
+            response = await client.post(
+                GROQ_API_URL,
+                headers=_GROQ_HEADERS,
+                content=orjson.dumps(payload),
+                timeout=GROQ_TIMEOUT,
+            )
+        response.raise_for_status()
 
-            data = response.json()
-            text = data["choices"][0]["message"]["content"].strip()
+        data = orjson.loads(response.content)
+        text = data["choices"][0]["message"]["content"].strip()
 
-            obj = extract_first_json_object(text)
-            if obj is None:
-                print(f"[GROQ] Could not parse JSON for {country}")
+        obj = extract_first_json_object(text)
+        if obj is None:
+            logger.warning("[GROQ] Could not parse JSON for %s", country)
+        else:
+            _DETAILS_CACHE.set(key, obj)
+            await shared_set(f"cd:{key}", obj, SHARED_DETAILS_TTL)
 
-            return obj
+        return obj
 
     except httpx.HTTPStatusError as e:
-        print(f"[GROQ] HTTP {e.response.status_code}: {e.response.text[:200]}")
+        logger.warning(
+            "[GROQ] HTTP %s: %.200s", e.response.status_code, e.response.text
+        )
         return None
-    except Exception as e:
-        print(f"[GROQ] Error: {traceback.format_exc()}")
+    except Exception:
+        logger.exception("[GROQ] Details error for %s", country)
         return None
 
 
+def _cultural_fact_payload(country: str) -> Dict[str, Any]:
+    """Build the Groq chat payload for a cultural fact request."""
+    return {
+        "model": GROQ_MODEL,
+        "messages": [
+            _FACT_SYSTEM_MSG,
+            {
+                "role": "user",
+                "content": _FACT_PROMPT_PREFIX + country + _FACT_PROMPT_SUFFIX,
+            },
+        ],
+        "temperature": 0.6,
+    }
+
+
 async def cultural_fact(country: str) -> str:
     """Generate concise cultural fact about the country."""
     if not country or not GROQ_API_KEY:
         return "Cultural fact unavailable."
 
-    prompt = f"""
-Provide ONE interesting, specific cultural fact about {country}.
+    key = country.strip().lower()
+    cached = _FACT_CACHE.get(key)
+    if cached is not None:
+        return cached
 
-Constraints:
-- 1 short paragraph (<= 60 words)
-- Avoid politics, NSFW content, stereotypes
-- Prefer: festivals, food, arts, etiquette, traditions, language
-- No emojis
+    payload = _cultural_fact_payload(country)
 
-Example: "In Japan, the 'Cherry Blossom Viewing' tradition dates back centuries..."
-""".strip()
+    try:
+        client = get_http()
+        async with _groq_slot():
+            response = await client.post(
+                GROQ_API_URL,
+                headers=_GROQ_HEADERS,
+                content=orjson.dumps(payload),
+                timeout=GROQ_TIMEOUT,
+            )
+        response.raise_for_status()
 
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json",
-    }
+        data = orjson.loads(response.content)
+        fact = data["choices"][0]["message"]["content"].strip()
+        _FACT_CACHE.set(key, fact)
+        return fact
 
-    payload = {
-        "model": GROQ_MODEL,
-        "messages": [
-            {"role": "system", "content": "You are a concise cultural assistant."},
-            {"role": "user", "content": prompt},
-        ],
-        "temperature": 0.6,
-    }
+    except Exception:
+        logger.exception("[GROQ] Fact error for %s", country)
+        return FACT_ERROR_TEXT
+
+
+async def cultural_fact_stream(country: str) -> AsyncIterator[str]:
+    """Stream the cultural fact token by token as Groq generates it."""
+    if not country or not GROQ_API_KEY:
+        yield "Cultural fact unavailable."
+        return
+
+    payload = _cultural_fact_payload(country)
+    payload["stream"] = True
+    streamed = False
 
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            response = await client.post(GROQ_API_URL, headers=headers, json=payload)
+        client = get_http()
+        # No caller-side wait_for around a stream, so bound the queueing here
+        async with _groq_slot(wait=FACT_TIMEOUT), client.stream(
+            "POST",
+            GROQ_API_URL,
+            headers=_GROQ_HEADERS,
+            content=orjson.dumps(payload),
+            timeout=GROQ_TIMEOUT,
+        ) as response:
             response.raise_for_status()
 
-            data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
+            # OpenAI-compatible SSE: "data: {...}" lines, "data: [DONE]" at the end
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                delta = orjson.loads(data)["choices"][0].get("delta", {})
+                if delta.get("content"):
+                    streamed = True
+                    yield delta["content"]
 
-    except Exception as e:
-        print(f"[GROQ] Fact error: {traceback.format_exc()}")
-        return "Sorry, I couldn't generate a cultural fact right now."
+    except Exception:
+        logger.exception("[GROQ] Fact stream error for %s", country)
+        # Don't append an apology to a fact that was already partly sent
+        if not streamed:
+            yield FACT_ERROR_TEXT